@@ -0,0 +1,182 @@
+"""Security middleware: API-key auth, security headers, rate limiting.
+
+The middlewares here are plain ASGI callables rather than
+BaseHTTPMiddleware subclasses: BaseHTTPMiddleware re-buffers every
+response through an anyio stream pair, which costs a task spawn and two
+queue hops per request and breaks streaming backpressure.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+from fastapi.security import HTTPBearer
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+
+# Hard cap on tracked clients; beyond this the least-recently-seen entry
+# is dropped (it just refills to a full bucket if the client returns)
+MAX_TRACKED_CLIENTS = 10_000
+SWEEP_INTERVAL_S = 60.0
+STALE_AFTER_S = 120.0
+
+# Probe and docs endpoints skip rate limiting entirely: health checks can
+# outnumber user traffic on a busy cluster, and counting them would both
+# waste CPU and let the probe's source IP churn the bucket LRU
+EXEMPT_PATHS = frozenset({"/", "/health", "/metrics", "/docs", "/openapi.json"})
+
+
+class APIKeyAuth:
+    """Bearer-token API-key check against a pre-hashed key set.
+
+    Keys are stored as fixed-size BLAKE2b-128 digests in a frozenset, so
+    validation is one hash plus an O(1) membership test regardless of how
+    many keys are configured — and comparing digests instead of the
+    secrets themselves means the lookup is not a timing oracle.
+    """
+
+    def __init__(self, api_keys: Iterable[str]):
+        self._bearer = HTTPBearer(auto_error=False)
+        self._key_digests = frozenset(
+            self._digest(key) for key in api_keys
+        )
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+    async def __call__(self, connection: HTTPConnection) -> None:
+        credentials = await self._bearer(connection)
+        if credentials is None:
+            raise HTTPException(status_code=401, detail="API key required")
+        if self._digest(credentials.credentials) not in self._key_digests:
+            raise HTTPException(status_code=403, detail="Invalid API key")
+
+
+@lru_cache(maxsize=1)
+def get_api_key_auth() -> APIKeyAuth:
+    """Construct the process-wide APIKeyAuth on first use.
+
+    Keys are read from settings (and hashed) lazily rather than at
+    import, so worker boot never blocks on configuration loading and
+    tests can override the dependency without reimporting the module.
+    """
+    from config import settings
+
+    return APIKeyAuth(settings.api_key_list)
+
+
+async def verify_api_key(connection: HTTPConnection) -> None:
+    """Route dependency enforcing the configured API keys.
+
+    Typed as HTTPConnection rather than Request so the same dependency
+    also guards the websocket propagation route: router-level
+    dependencies apply to websockets, where a Request-typed parameter
+    is never populated.
+    """
+    await get_api_key_auth()(connection)
+
+
+class SecurityHeadersMiddleware:
+    """Append static security headers to every HTTP response.
+
+    The header pairs are encoded to bytes once at import and spliced into
+    the ``http.response.start`` message directly, instead of going through
+    six MutableHeaders assignments per response.
+    """
+
+    HEADERS = (
+        (b"x-content-type-options", b"nosniff"),
+        (b"x-frame-options", b"DENY"),
+        (b"x-xss-protection", b"1; mode=block"),
+        (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+        (b"referrer-policy", b"no-referrer"),
+        (b"content-security-policy", b"default-src 'none'"),
+    )
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *self.HEADERS]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class RateLimitMiddleware:
+    """Per-client-IP rate limiting with a token bucket.
+
+    Each client is tracked as a single ``(tokens, last_refill)`` pair;
+    admission is two arithmetic operations per request with no per-window
+    bookkeeping to scan or purge.
+
+    State is per-process: ``__call__`` runs on a single event loop and
+    never awaits between reading and writing a bucket, so access is
+    race-free without locks or sharding. With ``SERVER_WORKERS > 1`` each
+    worker enforces the limit independently; an accurate global limit
+    would need shared state (e.g. Redis INCR+EXPIRE).
+    """
+
+    def __init__(self, app, requests_per_minute: int = 100):
+        self.app = app
+        self.capacity = float(requests_per_minute)
+        self.refill_rate = requests_per_minute / 60.0
+        # client_ip -> (tokens, last_refill); monotonic clock so wall-clock
+        # jumps can't mint or burn tokens. LRU-ordered so memory stays
+        # O(active clients) in a long-running process.
+        self.buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._sweep_task: Optional[asyncio.Task] = None
+
+    async def _sweep_stale_buckets(self):
+        """Periodically drop clients that haven't been seen in STALE_AFTER_S."""
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL_S)
+            now = time.monotonic()
+            stale = [
+                ip
+                for ip, (_, last_refill) in self.buckets.items()
+                if now - last_refill > STALE_AFTER_S
+            ]
+            for ip in stale:
+                del self.buckets[ip]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        # Created lazily so the task lands on the running server loop
+        if self._sweep_task is None or self._sweep_task.done():
+            self._sweep_task = asyncio.create_task(self._sweep_stale_buckets())
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+
+        now = time.monotonic()
+        tokens, last_refill = self.buckets.get(client_ip, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last_refill) * self.refill_rate)
+        if tokens < 1.0:
+            retry_after = (1.0 - tokens) / self.refill_rate
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded"},
+                headers={"Retry-After": f"{retry_after:.0f}"},
+            )
+            await response(scope, receive, send)
+            return
+        self.buckets[client_ip] = (tokens - 1.0, now)
+        self.buckets.move_to_end(client_ip)
+        if len(self.buckets) > MAX_TRACKED_CLIENTS:
+            self.buckets.popitem(last=False)
+
+        await self.app(scope, receive, send)
@@ -1,13 +1,18 @@
 """Health check and monitoring endpoints."""
 import psutil
 import torch
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 from pydantic import BaseModel
 
 from config import settings
 
 router = APIRouter()
 
+# CUDA availability and device count are fixed for the process lifetime;
+# cache them so high-frequency liveness probes skip the driver call
+_GPU_AVAILABLE = torch.cuda.is_available()
+_GPU_COUNT = torch.cuda.device_count() if _GPU_AVAILABLE else 0
+
 
 class HealthResponse(BaseModel):
     """Health check response."""
@@ -41,8 +46,8 @@ async def health_check():
     """Health check endpoint."""
     return HealthResponse(
         status="healthy",
-        gpu_available=torch.cuda.is_available(),
-        gpu_count=torch.cuda.device_count() if torch.cuda.is_available() else 0,
+        gpu_available=_GPU_AVAILABLE,
+        gpu_count=_GPU_COUNT,
         active_sessions=0,  # TODO: get from session manager
     )
 
@@ -60,7 +65,7 @@ async def models_info(req: Request):
         capabilities=["text_prompt", "box_prompt", "batch_processing", "feature_caching"],
     )
 
-    if req.app.state.image_model and torch.cuda.is_available():
+    if req.app.state.image_model and _GPU_AVAILABLE:
         torch.cuda.reset_peak_memory_stats()
         memory_bytes = torch.cuda.memory_allocated(device=settings.image_model_device)
         image_info.memory_mb = memory_bytes / (1024 * 1024)
@@ -75,26 +80,43 @@ async def models_info(req: Request):
 @router.get("/metrics")
 async def metrics():
     """Prometheus-style metrics endpoint."""
-    metrics_text = []
-
-    # GPU metrics
-    if torch.cuda.is_available():
-        for i in range(torch.cuda.device_count()):
-            memory_allocated = torch.cuda.memory_allocated(i)
-            memory_reserved = torch.cuda.memory_reserved(i)
-
-            metrics_text.append(
-                f'sam3_gpu_memory_allocated_bytes{{gpu="{i}"}} {memory_allocated}'
-            )
-            metrics_text.append(
-                f'sam3_gpu_memory_reserved_bytes{{gpu="{i}"}} {memory_reserved}'
-            )
+    # One list slot per GPU block plus one for system metrics; each block
+    # is a single f-string so the join does minimal intermediate work
+    metrics_text = [""] * (_GPU_COUNT + 1)
+
+    # GPU metrics (single memory_stats read per device; reserved-allocated
+    # fragmentation and alloc-retry/OOM counters matter for OOM alerting,
+    # not just current allocated bytes)
+    for i in range(_GPU_COUNT):
+        stats = torch.cuda.memory_stats(i)
+        memory_allocated = stats.get("allocated_bytes.all.current", 0)
+        memory_reserved = stats.get("reserved_bytes.all.current", 0)
+
+        metrics_text[i] = (
+            f'sam3_gpu_memory_allocated_bytes{{gpu="{i}"}} {memory_allocated}\n'
+            f'sam3_gpu_memory_reserved_bytes{{gpu="{i}"}} {memory_reserved}\n'
+            f'sam3_gpu_memory_allocated_peak_bytes{{gpu="{i}"}} '
+            f'{stats.get("allocated_bytes.all.peak", 0)}\n'
+            f'sam3_gpu_memory_reserved_peak_bytes{{gpu="{i}"}} '
+            f'{stats.get("reserved_bytes.all.peak", 0)}\n'
+            f'sam3_gpu_memory_fragmentation_bytes{{gpu="{i}"}} '
+            f"{memory_reserved - memory_allocated}\n"
+            f'sam3_gpu_alloc_retries_total{{gpu="{i}"}} '
+            f'{stats.get("num_alloc_retries", 0)}\n'
+            f'sam3_gpu_ooms_total{{gpu="{i}"}} {stats.get("num_ooms", 0)}'
+        )
 
     # System metrics
     cpu_percent = psutil.cpu_percent()
     memory_percent = psutil.virtual_memory().percent
 
-    metrics_text.append(f"sam3_cpu_usage_percent {cpu_percent}")
-    metrics_text.append(f"sam3_memory_usage_percent {memory_percent}")
+    metrics_text[-1] = (
+        f"sam3_cpu_usage_percent {cpu_percent}\n"
+        f"sam3_memory_usage_percent {memory_percent}"
+    )
 
-    return "\n".join(metrics_text)
+    # Prometheus text exposition content type so scrapers use the fast parser
+    return Response(
+        content="\n".join(metrics_text),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,15 +1,25 @@
 """Image inference endpoints."""
-import base64
-import hashlib
+import asyncio
+import threading
 import time
+import weakref
+from collections import OrderedDict
 from io import BytesIO
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
 from loguru import logger
 from PIL import Image
+from pydantic import TypeAdapter
 
-from api.schemas.common_schemas import PromptType
+from api.schemas.common_schemas import Prompt, PromptType
+from config import settings
+from utils.encoding import b64decode
+from utils.executor import inference_executor
+from utils.hashing import fast_hasher, image_cache_key
 from api.schemas.image_schemas import (
+    BatchImageRequest,
+    BatchImageResponse,
+    BatchImageResultItem,
     CachedFeaturesRequest,
     CachedFeaturesResponse,
     CachedFeaturesResultItem,
@@ -19,17 +29,120 @@ from api.schemas.image_schemas import (
 
 router = APIRouter()
 
+# LRU of decoded images keyed on a cheap prefix hash of the base64 payload,
+# so clients iterating prompts on the same image skip decode entirely.
+# Bounded by decoded bytes, not entry count: 64 full-resolution photos
+# would be gigabytes of host RAM, while the same budget holds hundreds
+# of typical inference-sized images.
+_DECODE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_decode_cache: "OrderedDict[str, Image.Image]" = OrderedDict()
+_decode_cache_bytes = 0
+# decode_base64_image runs on executor threads concurrently; same pattern
+# as the model's feature-cache lock
+_decode_cache_lock = threading.Lock()
 
-def decode_base64_image(base64_str: str) -> Image.Image:
-    """Decode base64 string to PIL Image."""
+
+def _image_nbytes(image: Image.Image) -> int:
+    """Decoded buffer size of an RGB image (3 bytes per pixel)."""
+    return image.width * image.height * 3
+
+# Feature-cache keys memoized per decoded image object; on a decode-cache hit
+# the same Image instance is returned, so the pixel-buffer hash is also reused.
+_feature_keys: "weakref.WeakKeyDictionary[Image.Image, str]" = weakref.WeakKeyDictionary()
+
+# Per-key locks so concurrent requests for the same fresh image run the
+# feature encoder once instead of racing (thundering-herd fix)
+_feature_locks: dict = {}
+
+# Validates the JSON-encoded prompts field of multipart uploads
+_prompts_adapter = TypeAdapter(list[Prompt])
+
+
+def _split_prompts(prompts):
+    """Bucket prompts by type in one pass with dict dispatch.
+
+    Returns:
+        Tuple of (text_prompts, box_prompts, point_prompts) in the formats
+        expected by SAM3ImageModel.segment_combined
+    """
+    text_prompts = []
+    box_prompts = []
+    point_prompts = []
+
+    bucket_prompt = {
+        PromptType.TEXT: lambda p: text_prompts.append(p.text),
+        PromptType.BOX: lambda p: box_prompts.append((p.box, p.label)),
+        PromptType.POINT: lambda p: point_prompts.append((p.points, p.point_labels)),
+    }
+
+    for prompt in prompts:
+        bucket_prompt[prompt.type](prompt)
+
+    return text_prompts, box_prompts, point_prompts
+
+
+def _decode_cache_key(base64_str: str) -> str:
+    """Hash length + first/last 4KB of the base64 string (avoids full pass)."""
+    hasher = fast_hasher()
+    hasher.update(str(len(base64_str)).encode())
+    hasher.update(base64_str[:4096].encode())
+    hasher.update(base64_str[-4096:].encode())
+    return hasher.hexdigest()
+
+
+def cached_image_key(image: Image.Image) -> str:
+    """Return the feature-cache key for an image, memoized per image object."""
+    key = _feature_keys.get(image)
+    if key is None:
+        key = image_cache_key(image)
+        _feature_keys[image] = key
+    return key
+
+
+def decode_image_bytes(image_data: bytes) -> Image.Image:
+    """Decode raw image bytes to an RGB PIL Image."""
     try:
-        image_data = base64.b64decode(base64_str)
         image = Image.open(BytesIO(image_data))
+        # Let libjpeg IDCT-scale during decode (native 1/2, 1/4, 1/8 steps)
+        # instead of decoding full resolution the model will downscale anyway;
+        # no-op for non-JPEG formats
+        target = settings.image_model_resolution
+        image.draft("RGB", (target, target))
         return image.convert("RGB")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image data: {str(e)}")
 
 
+def decode_base64_image(base64_str: str) -> Image.Image:
+    """Decode base64 string to PIL Image (with repeat-upload cache)."""
+    global _decode_cache_bytes
+
+    cache_key = _decode_cache_key(base64_str)
+    with _decode_cache_lock:
+        cached = _decode_cache.get(cache_key)
+        if cached is not None:
+            _decode_cache.move_to_end(cache_key)
+            return cached
+
+    try:
+        image_data = b64decode(base64_str)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid image data: {str(e)}")
+    image = decode_image_bytes(image_data)
+
+    with _decode_cache_lock:
+        if cache_key not in _decode_cache:
+            _decode_cache[cache_key] = image
+            _decode_cache_bytes += _image_nbytes(image)
+            while (
+                _decode_cache_bytes > _DECODE_CACHE_MAX_BYTES
+                and len(_decode_cache) > 1
+            ):
+                _, evicted = _decode_cache.popitem(last=False)
+                _decode_cache_bytes -= _image_nbytes(evicted)
+    return image
+
+
 @router.post("/segment", response_model=ImageSegmentResponse)
 async def segment_image(request: ImageSegmentRequest, req: Request):
     """Segment image with prompts.
@@ -44,57 +157,135 @@ async def segment_image(request: ImageSegmentRequest, req: Request):
     start_time = time.time()
 
     try:
-        # Decode image
-        image = decode_base64_image(request.image)
-        logger.info(f"Processing image of size {image.size}")
-
-        # Extract prompts by type
-        text_prompts = []
-        box_prompts = []
-        point_prompts = []
-
-        for prompt in request.prompts:
-            if prompt.type == PromptType.TEXT:
-                text_prompts.append(prompt.text)
-            elif prompt.type == PromptType.BOX:
-                box_prompts.append((prompt.box, prompt.label))
-            elif prompt.type == PromptType.POINT:
-                point_prompts.append((prompt.points, prompt.point_labels))
-
-        # Segment with combined prompts
-        if text_prompts or box_prompts or point_prompts:
-            masks, boxes, scores = req.app.state.image_model.segment_combined(
-                image=image,
-                text_prompts=text_prompts if text_prompts else None,
-                boxes=box_prompts if box_prompts else None,
-                points=point_prompts if point_prompts else None,
-            )
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="At least one text, box, or point prompt is required",
-            )
+        # Decode image off the event loop (PIL releases the GIL during decode)
+        loop = asyncio.get_running_loop()
+        image = await loop.run_in_executor(None, decode_base64_image, request.image)
+        # Deferred formatting: loguru only renders the message if emitted
+        logger.info("Processing image of size {}", image.size)
+
+        # Inference runs on the bounded executor: the GPU forward takes
+        # hundreds of ms and would otherwise block every other request,
+        # and the small pool keeps concurrent requests from stacking
+        # simultaneous forwards against one model
+        return await loop.run_in_executor(
+            inference_executor(),
+            _segment_decoded_image,
+            req,
+            image,
+            request.prompts,
+            start_time,
+        )
 
-        inference_time = (time.time() - start_time) * 1000
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Segmentation failed")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        logger.info(
-            f"Segmentation complete: {len(masks)} masks in {inference_time:.1f}ms"
+
+def _segment_decoded_image(
+    req: Request, image: Image.Image, prompts, start_time: float
+) -> ImageSegmentResponse:
+    """Run combined segmentation on a decoded image and build the response."""
+    # Extract prompts by type
+    text_prompts, box_prompts, point_prompts = _split_prompts(prompts)
+
+    # Segment with combined prompts
+    if text_prompts or box_prompts or point_prompts:
+        masks, boxes, scores = req.app.state.image_model.segment_combined(
+            image=image,
+            text_prompts=text_prompts if text_prompts else None,
+            boxes=box_prompts if box_prompts else None,
+            points=point_prompts if point_prompts else None,
+        )
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one text, box, or point prompt is required",
         )
 
-        return ImageSegmentResponse(
-            masks=masks,
-            boxes=boxes,
-            scores=scores,
-            num_masks=len(masks),
-            image_size={"width": image.size[0], "height": image.size[1]},
-            visualization_url=None,  # TODO: implement visualization
-            inference_time_ms=inference_time,
+    inference_time = (time.time() - start_time) * 1000
+
+    logger.info(
+        "Segmentation complete: {} masks in {:.1f}ms", len(masks), inference_time
+    )
+
+    return ImageSegmentResponse(
+        masks=masks,
+        boxes=boxes,
+        scores=scores,
+        num_masks=len(masks),
+        image_size={"width": image.size[0], "height": image.size[1]},
+        visualization_url=None,  # TODO: implement visualization
+        inference_time_ms=inference_time,
+    )
+
+
+@router.post("/segment/binary", response_model=ImageSegmentResponse)
+async def segment_image_binary(
+    req: Request,
+    file: UploadFile = File(..., description="Raw image file"),
+    prompts: str = Form(..., description="JSON-encoded list of prompts"),
+    format: str = Form(
+        None, description='Optional format hint; "raw_rgb" skips decode entirely'
+    ),
+    width: int = Form(None, description="Image width (required for raw_rgb)"),
+    height: int = Form(None, description="Image height (required for raw_rgb)"),
+):
+    """Segment a raw multipart image upload.
+
+    Skips base64 entirely: no 33% payload inflation and no decode pass
+    before inference. Recommended over /segment for large images. With
+    format="raw_rgb" plus width/height the payload is treated as a raw
+    RGB pixel buffer and wrapped zero-copy via Image.frombuffer — no
+    format sniffing and no decode at all.
+    """
+    if req.app.state.image_model is None:
+        raise HTTPException(status_code=503, detail="Image model not loaded")
+
+    start_time = time.time()
+
+    try:
+        prompt_list = _prompts_adapter.validate_json(prompts)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid prompts: {str(e)}")
+
+    try:
+        image_data = await file.read()
+        if format == "raw_rgb":
+            if not width or not height:
+                raise HTTPException(
+                    status_code=400,
+                    detail="width and height are required for raw_rgb uploads",
+                )
+            if len(image_data) != width * height * 3:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"raw_rgb payload size mismatch for {width}x{height}",
+                )
+            # Wraps the upload buffer without copying or decoding
+            image = Image.frombuffer(
+                "RGB", (width, height), image_data, "raw", "RGB", 0, 1
+            )
+        else:
+            image = await asyncio.get_running_loop().run_in_executor(
+                None, decode_image_bytes, image_data
+            )
+
+        # Inference on the bounded executor, same as /segment
+        return await asyncio.get_running_loop().run_in_executor(
+            inference_executor(),
+            _segment_decoded_image,
+            req,
+            image,
+            prompt_list,
+            start_time,
         )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Segmentation failed: {e}")
+        logger.exception("Segmentation failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -113,22 +304,39 @@ async def segment_with_cached_features(request: CachedFeaturesRequest, req: Requ
     start_time = time.time()
 
     try:
-        # Decode image
-        image = decode_base64_image(request.image)
-
-        # Generate cache key from image hash
-        image_bytes = BytesIO()
-        image.save(image_bytes, format="PNG")
-        cache_key = hashlib.md5(image_bytes.getvalue()).hexdigest()
-
-        # Cache features if not already cached
-        cache_hit = cache_key in req.app.state.image_model.feature_cache
+        # Decode image off the event loop (PIL releases the GIL during decode)
+        loop = asyncio.get_running_loop()
+        image = await loop.run_in_executor(None, decode_base64_image, request.image)
+
+        # Generate cache key from raw pixel buffer (no PNG re-encode),
+        # memoized per decoded image so repeat uploads skip the hash too
+        cache_key = cached_image_key(image)
+
+        # Cache features if not already cached; the per-key lock makes
+        # concurrent first requests for the same image encode only once.
+        # has_cached_features is TTL-aware — raw dict membership would
+        # count an expired entry as a hit and then fail the lookup.
+        cache_hit = req.app.state.image_model.has_cached_features(cache_key)
         if not cache_hit:
-            req.app.state.image_model.cache_features(image, cache_key)
-
-        # Segment with all text prompts
-        results_list = req.app.state.image_model.segment_with_cached_features(
-            cache_key, request.text_prompts
+            lock = _feature_locks.setdefault(cache_key, asyncio.Lock())
+            async with lock:
+                if not req.app.state.image_model.has_cached_features(cache_key):
+                    await loop.run_in_executor(
+                        inference_executor(),
+                        req.app.state.image_model.cache_features,
+                        image,
+                        cache_key,
+                    )
+            if not lock.locked():
+                _feature_locks.pop(cache_key, None)
+
+        # Segment with all text prompts; the per-prompt grounding loop is
+        # GPU work and runs on the bounded executor like the other endpoints
+        results_list = await loop.run_in_executor(
+            inference_executor(),
+            req.app.state.image_model.segment_with_cached_features,
+            cache_key,
+            request.text_prompts,
         )
 
         # Format results
@@ -147,8 +355,10 @@ async def segment_with_cached_features(request: CachedFeaturesRequest, req: Requ
         inference_time = (time.time() - start_time) * 1000
 
         logger.info(
-            f"Cached features segmentation: {len(request.text_prompts)} prompts "
-            f"in {inference_time:.1f}ms (cache_hit={cache_hit})"
+            "Cached features segmentation: {} prompts in {:.1f}ms (cache_hit={})",
+            len(request.text_prompts),
+            inference_time,
+            cache_hit,
         )
 
         return CachedFeaturesResponse(
@@ -160,5 +370,88 @@ async def segment_with_cached_features(request: CachedFeaturesRequest, req: Requ
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Cached features segmentation failed: {e}")
+        logger.exception("Cached features segmentation failed")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/segment-batch", response_model=BatchImageResponse)
+async def segment_image_batch(request: BatchImageRequest, req: Request):
+    """Segment a batch of images in a single request.
+
+    Coalescing images into one request amortizes HTTP/JSON overhead and
+    keeps the GPU fed back-to-back instead of idling between requests.
+    Per-image failures are reported in the result items without failing
+    the whole batch.
+    """
+    if req.app.state.image_model is None:
+        raise HTTPException(status_code=503, detail="Image model not loaded")
+
+    start_time = time.time()
+    loop = asyncio.get_running_loop()
+    # Bound in-flight items to the client-requested concurrency so decode
+    # overlaps inference without flooding the executor
+    semaphore = asyncio.Semaphore(request.max_concurrent)
+
+    async def process_item(item) -> BatchImageResultItem:
+        async with semaphore:
+            return await _process_unbounded(item)
+
+    async def _process_unbounded(item) -> BatchImageResultItem:
+        try:
+            image = await loop.run_in_executor(None, decode_base64_image, item.image)
+            text_prompts, box_prompts, point_prompts = _split_prompts(item.prompts)
+
+            if not (text_prompts or box_prompts or point_prompts):
+                raise HTTPException(
+                    status_code=400,
+                    detail="At least one text, box, or point prompt is required",
+                )
+
+            masks, boxes, scores = await loop.run_in_executor(
+                inference_executor(),
+                lambda: req.app.state.image_model.segment_combined(
+                    image=image,
+                    text_prompts=text_prompts if text_prompts else None,
+                    boxes=box_prompts if box_prompts else None,
+                    points=point_prompts if point_prompts else None,
+                ),
+            )
+
+            return BatchImageResultItem(
+                id=item.id,
+                masks=masks,
+                boxes=boxes,
+                scores=scores,
+                num_masks=len(masks),
+            )
+        except HTTPException as e:
+            return BatchImageResultItem(
+                id=item.id, masks=[], boxes=[], scores=[], num_masks=0,
+                error=str(e.detail),
+            )
+        except Exception as e:
+            return BatchImageResultItem(
+                id=item.id, masks=[], boxes=[], scores=[], num_masks=0, error=str(e)
+            )
+
+    results = list(
+        await asyncio.gather(*(process_item(item) for item in request.images))
+    )
+
+    failed = sum(1 for r in results if r.error is not None)
+    total_time = (time.time() - start_time) * 1000
+
+    logger.info(
+        "Batch segmentation: {} images ({} failed) in {:.1f}ms",
+        len(results),
+        failed,
+        total_time,
+    )
+
+    return BatchImageResponse(
+        results=results,
+        total_images=len(results),
+        successful=len(results) - failed,
+        failed=failed,
+        total_time_ms=total_time,
+    )
@@ -1,22 +1,32 @@
 """Video inference API routes."""
 import asyncio
-import base64
-import hashlib
 import os
 import tempfile
 import time
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 
 # Removed import server to break circular dependency
+from api.schemas.common_schemas import PromptType
 from api.schemas.video_schemas import (
     AddPromptRequest,
     AddPromptResponse,
     CloseSessionResponse,
-    FrameResult,
     PropagateRequest,
     PropagateResponse,
     RemoveObjectResponse,
@@ -29,15 +39,151 @@ from api.schemas.video_schemas import (
     VideoSessionStatus,
 )
 from sam3.logger import get_logger
+from utils.encoding import b64decode
+from utils.executor import inference_executor
+from utils.hashing import fast_hasher, fast_hexdigest
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Streaming propagation batches frames into one send_bytes per group to
+# amortize per-message overhead (Pydantic dump + json encode + send syscall)
+STREAM_BATCH_SIZE = 8
+STREAM_FLUSH_INTERVAL_S = 0.05
+
+# Static envelope fragments for streamed frames; only frame_index and the
+# objects payload vary, so the constant parts are encoded exactly once
+_FRAME_PREFIX = b'{"type":"frame","frame_index":'
+_FRAME_MID = b',"objects":'
+_FRAME_SUFFIX = b"}"
+_BATCH_PREFIX = b'{"type":"batch","frames":['
+_BATCH_SUFFIX = b"]}"
+
+# Cached videos are content-addressed and reused across sessions, so
+# nothing removes them on session close; the sweep below bounds /tmp usage
+_VIDEO_CACHE_MAX_AGE_S = 24 * 3600
+_VIDEO_CACHE_SWEEP_INTERVAL_S = 3600.0
+
+
+@lru_cache(maxsize=1)
+def _video_temp_dir() -> Path:
+    """Process-wide directory for cached videos.
+
+    gettempdir() walks environment variables and mkdir costs a stat+mkdir
+    syscall pair; both happen once per process instead of per request.
+    """
+    temp_dir = Path(tempfile.gettempdir()) / "sam3_videos"
+    temp_dir.mkdir(exist_ok=True)
+    return temp_dir
+
+
+async def cleanup_video_cache():
+    """Periodically delete cached videos older than _VIDEO_CACHE_MAX_AGE_S.
+
+    Run as a background task owned by the server lifespan; cancelled on
+    shutdown.
+    """
+    temp_dir = _video_temp_dir()
+    while True:
+        await asyncio.sleep(_VIDEO_CACHE_SWEEP_INTERVAL_S)
+        cutoff = time.time() - _VIDEO_CACHE_MAX_AGE_S
+        try:
+            stale = [p for p in temp_dir.iterdir() if p.stat().st_mtime < cutoff]
+        except FileNotFoundError:
+            continue
+        for path in stale:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+async def _send_stream_message(websocket: WebSocket, message: StreamFrameMessage):
+    """Send a single stream message as orjson-encoded bytes."""
+    await websocket.send_bytes(orjson.dumps(message.model_dump(exclude_none=True)))
+
+
+async def require_video_session(session_id: str, req: Request) -> dict:
+    """Dependency resolving an active video session.
+
+    Centralizes the video-model 503 and session 404 checks so each
+    session-scoped route does a single manager lookup. The resolved
+    session is memoized on `req.state.session`, so any code holding only
+    the Request reads a plain attribute instead of re-entering the
+    manager.
 
-def _save_video_from_request(request: StartSessionRequest) -> str:
+    Raises:
+        HTTPException: 503 if video inference is disabled, 404 if the
+            session does not exist
+    """
+    session = getattr(req.state, "session", None)
+    if session is not None:
+        return session
+
+    if req.app.state.video_model is None:
+        raise HTTPException(status_code=503, detail="Video inference not enabled")
+
+    session = req.app.state.session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+
+    req.state.session = session
+    return session
+
+
+def _write_base64_video(video_base64: str, temp_dir: Path) -> str:
+    """Stream-decode a base64 video to disk, hashing as it is written.
+
+    Decodes in 1MB chunks and feeds each chunk to both an incremental
+    hasher and the output file, so peak memory stays O(chunk) instead of
+    O(video) and the bytes are only touched once. The final file is named
+    by content hash for deduplication.
+
+    Args:
+        video_base64: Base64-encoded video payload
+        temp_dir: Directory to write the video into
+
+    Returns:
+        Path to the written video file
+    """
+    # Base64 decodes in 4-char quanta; 1MB of encoded text per chunk
+    chunk_chars = 1 << 20
+
+    hasher = fast_hasher()
+    pending = ""
+    with tempfile.NamedTemporaryFile(dir=temp_dir, suffix=".part", delete=False) as f:
+        for start in range(0, len(video_base64), chunk_chars):
+            # Whitespace (MIME-style line wrapping) is legal base64 input;
+            # strip it before slicing to quanta and carry the sub-quantum
+            # remainder into the next chunk so every decode is aligned
+            chunk = pending + "".join(
+                video_base64[start : start + chunk_chars].split()
+            )
+            usable = len(chunk) & ~3
+            pending = chunk[usable:]
+            raw = b64decode(chunk[:usable])
+            hasher.update(raw)
+            f.write(raw)
+        if pending:
+            # Non-empty leftover under 4 chars means truncated input;
+            # b64decode raises and the caller maps it to a 400
+            raw = b64decode(pending)
+            hasher.update(raw)
+            f.write(raw)
+        partial_path = f.name
+
+    video_path = temp_dir / f"{hasher.hexdigest()}.mp4"
+    os.replace(partial_path, video_path)
+    return str(video_path)
+
+
+async def _save_video_from_request(request: StartSessionRequest) -> str:
     """
     Save video from request to temporary file.
 
+    Network download and base64 decode run off the event loop so other
+    requests keep being served during long uploads.
+
     Args:
         request: StartSessionRequest with video source
 
@@ -51,51 +197,87 @@ def _save_video_from_request(request: StartSessionRequest) -> str:
         return request.video_path
 
     if request.video_url:
-        # Download video from URL
-        import urllib.request
+        # Download video from URL (async streaming, no event-loop blocking)
+        import aiofiles
+        import httpx
         from urllib.parse import urlparse
-        
+
         try:
             # Create temporary file to store downloaded video
-            temp_dir = Path(tempfile.gettempdir()) / "sam3_videos"
-            temp_dir.mkdir(exist_ok=True)
-            
-            # Generate a unique filename based on URL
-            url_hash = hashlib.md5(request.video_url.encode()).hexdigest()
+            temp_dir = _video_temp_dir()
+
+            # Generate a unique filename based on URL (non-cryptographic key)
+            url_hash = fast_hexdigest(request.video_url.encode())
             parsed_url = urlparse(request.video_url)
             ext = os.path.splitext(parsed_url.path)[1] or ".mp4"
             temp_video_path = temp_dir / f"downloaded_{url_hash}{ext}"
-            
-            # Download the video file
-            urllib.request.urlretrieve(request.video_url, str(temp_video_path))
-            
+            meta_path = temp_dir / f"downloaded_{url_hash}.meta"
+
+            # Revalidate a cached copy instead of re-downloading; the
+            # sidecar .meta stores the validators from the last download
+            conditional_headers = {}
+            if temp_video_path.exists() and meta_path.exists():
+                try:
+                    meta = orjson.loads(meta_path.read_bytes())
+                except Exception:
+                    meta = {}
+                if meta.get("etag"):
+                    conditional_headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    conditional_headers["If-Modified-Since"] = meta["last_modified"]
+                if not conditional_headers and temp_video_path.stat().st_size > 0:
+                    # Origin gave no validators on the last download, so a
+                    # conditional request can't help — reuse the cached copy
+                    # outright rather than re-transfer it every session
+                    return str(temp_video_path)
+
+            async with httpx.AsyncClient(follow_redirects=True) as client:
+                async with client.stream(
+                    "GET", request.video_url, headers=conditional_headers
+                ) as response:
+                    if response.status_code == 304:
+                        # Remote unchanged; reuse the cached file
+                        return str(temp_video_path)
+                    response.raise_for_status()
+
+                    # Stream the video file to disk in 1MB chunks
+                    async with aiofiles.open(temp_video_path, "wb") as f:
+                        async for chunk in response.aiter_bytes(chunk_size=1 << 20):
+                            await f.write(chunk)
+
+                    meta_path.write_bytes(
+                        orjson.dumps(
+                            {
+                                "etag": response.headers.get("etag"),
+                                "last_modified": response.headers.get("last-modified"),
+                            }
+                        )
+                    )
+
             # Verify that the file was downloaded
             if not temp_video_path.exists():
                 raise HTTPException(
                     status_code=500, detail="Failed to download video from URL"
                 )
-                
+
             return str(temp_video_path)
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to download video from URL: {str(e)}"
             )
 
     if request.video_base64:
-        # Decode base64 and save to temp file
+        # Stream-decode base64 to disk in the executor (single pass,
+        # content-hash filename, O(chunk) peak memory)
         try:
-            video_bytes = base64.b64decode(request.video_base64)
-            temp_dir = Path(tempfile.gettempdir()) / "sam3_videos"
-            temp_dir.mkdir(exist_ok=True)
-
-            # Generate filename from hash
-            video_hash = hashlib.md5(video_bytes).hexdigest()
-            video_path = temp_dir / f"{video_hash}.mp4"
-
-            with open(video_path, "wb") as f:
-                f.write(video_bytes)
+            temp_dir = _video_temp_dir()
 
-            return str(video_path)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, _write_base64_video, request.video_base64, temp_dir
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=400, detail=f"Failed to decode video: {str(e)}"
@@ -122,73 +304,153 @@ async def start_video_session(request: StartSessionRequest, req: Request):
 
     try:
         # Save video to file
-        video_path = _save_video_from_request(request)
-
-        # Start session with SAM3
-        session_id, video_info = req.app.state.video_model.start_session(
-            video_path=video_path, session_id=request.session_id
+        video_path = await _save_video_from_request(request)
+
+        # Session start loads frames and runs GPU work; keep it off the
+        # event loop on the bounded inference executor
+        return await asyncio.get_running_loop().run_in_executor(
+            inference_executor(),
+            _start_session_from_path,
+            req,
+            video_path,
+            request.session_id,
         )
 
-        # Register session in manager
-        req.app.state.session_manager.create_session(
-            session_id=session_id, session_type="video", video_info=video_info
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Failed to start session")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _start_session_from_path(
+    req: Request, video_path: str, session_id=None
+) -> StartSessionResponse:
+    """Start a SAM3 session for a saved video and register it."""
+    # Start session with SAM3
+    session_id, video_info = req.app.state.video_model.start_session(
+        video_path=video_path, session_id=session_id
+    )
+
+    # Register session in manager
+    req.app.state.session_manager.create_session(
+        session_id=session_id, session_type="video", video_info=video_info
+    )
+
+    return StartSessionResponse(
+        session_id=session_id,
+        video_info=video_info,
+        status=VideoSessionStatus.READY,
+    )
+
+
+@router.post("/session/start/binary", response_model=StartSessionResponse)
+async def start_video_session_binary(
+    req: Request,
+    file: UploadFile = File(..., description="Raw video file"),
+    session_id: str = Form(None),
+):
+    """
+    Start a video session from a raw multipart upload.
+
+    Skips base64 transit (33% payload inflation plus a full decode pass);
+    the upload is streamed to disk in chunks and content-hashed on the fly.
+    """
+    if req.app.state.video_model is None:
+        raise HTTPException(
+            status_code=503, detail="Video inference is not enabled on this server"
         )
 
-        return StartSessionResponse(
-            session_id=session_id,
-            video_info=video_info,
-            status=VideoSessionStatus.READY,
+    try:
+        temp_dir = _video_temp_dir()
+
+        ext = os.path.splitext(file.filename or "")[1] or ".mp4"
+        hasher = fast_hasher()
+        with tempfile.NamedTemporaryFile(
+            dir=temp_dir, suffix=".part", delete=False
+        ) as f:
+            while chunk := await file.read(1 << 20):
+                hasher.update(chunk)
+                f.write(chunk)
+            partial_path = f.name
+
+        video_path = temp_dir / f"{hasher.hexdigest()}{ext}"
+        os.replace(partial_path, video_path)
+
+        # Off the event loop, same as /session/start
+        return await asyncio.get_running_loop().run_in_executor(
+            inference_executor(),
+            _start_session_from_path,
+            req,
+            str(video_path),
+            session_id,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Failed to start session: {e}")
+        logger.exception("Failed to start session")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/session/{session_id}/prompt", response_model=AddPromptResponse)
-async def add_prompt_to_frame(session_id: str, request: AddPromptRequest, req: Request):
+async def add_prompt_to_frame(
+    session_id: str,
+    request: AddPromptRequest,
+    req: Request,
+    session: dict = Depends(require_video_session),
+):
     """
     Add prompts to a specific frame in the video.
 
     This initializes or refines object tracking for a particular frame.
     The prompts will be used as reference for propagation.
     """
-    if req.app.state.video_model is None:
-        raise HTTPException(status_code=503, detail="Video inference not enabled")
-
-    # Check session exists
-    session = req.app.state.session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-
     try:
         req.app.state.session_manager.update_session_status(
             session_id, VideoSessionStatus.PROCESSING
         )
 
-        # Extract prompts
-        text_prompts = [p.text for p in request.prompts if hasattr(p, "text")]
-        text_prompt = text_prompts[0] if text_prompts else None
-
-        box_prompts = [p for p in request.prompts if hasattr(p, "box")]
-        boxes = [p.box for p in box_prompts] if box_prompts else None
-        box_labels = [p.label for p in box_prompts] if box_prompts else None
-
-        point_prompts = [p for p in request.prompts if hasattr(p, "point")]
-        points = [p.point for p in point_prompts] if point_prompts else None
-        point_labels = [p.label for p in point_prompts] if point_prompts else None
-
-        # Add prompt to SAM3
-        logger.info(f"Frame index is  {request.frame_index}...")
-        frame_idx, obj_ids, masks, boxes_out, scores = req.app.state.video_model.add_prompt(
-            session_id=session_id,
-            frame_index=request.frame_index,
-            text_prompt=text_prompt,
-            points=points,
-            point_labels=point_labels,
-            boxes=boxes,
-            box_labels=box_labels,
-            obj_id=request.obj_id,
+        # Extract prompts in a single typed pass (no hasattr probing)
+        text_prompt = None
+        boxes = []
+        box_labels = []
+        points = []
+        point_labels = []
+
+        for p in request.prompts:
+            ptype = p.type
+            if ptype == PromptType.TEXT:
+                if text_prompt is None:
+                    text_prompt = p.text
+            elif ptype == PromptType.BOX:
+                boxes.append(p.box)
+                box_labels.append(p.label)
+            elif ptype == PromptType.POINT:
+                points.extend(p.points)
+                point_labels.extend(p.point_labels)
+
+        boxes = boxes or None
+        box_labels = box_labels or None
+        points = points or None
+        point_labels = point_labels or None
+
+        # Add prompt to SAM3; the grounding forward runs on the bounded
+        # inference executor, not the event loop
+        logger.debug("Adding prompt at frame index %s", request.frame_index)
+        frame_idx, obj_ids, masks, boxes_out, scores = await asyncio.get_running_loop().run_in_executor(
+            inference_executor(),
+            partial(
+                req.app.state.video_model.add_prompt,
+                session_id=session_id,
+                frame_index=request.frame_index,
+                text_prompt=text_prompt,
+                points=points,
+                point_labels=point_labels,
+                boxes=boxes,
+                box_labels=box_labels,
+                obj_id=request.obj_id,
+            ),
         )
 
         # Update session stats
@@ -212,25 +474,23 @@ async def add_prompt_to_frame(session_id: str, request: AddPromptRequest, req: R
         req.app.state.session_manager.update_session_status(
             session_id, VideoSessionStatus.ERROR, error=str(e)
         )
-        logger.error(f"Failed to add prompt: {e}")
+        logger.exception("Failed to add prompt")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/session/{session_id}/propagate", response_model=PropagateResponse)
-async def propagate_tracking(session_id: str, request: PropagateRequest, req: Request):
+async def propagate_tracking(
+    session_id: str,
+    request: PropagateRequest,
+    req: Request,
+    session: dict = Depends(require_video_session),
+):
     """
     Propagate object tracking through video frames (non-streaming).
 
     Use this endpoint for batch processing. For real-time streaming,
     use the WebSocket endpoint at /ws/propagate/{session_id}.
     """
-    if req.app.state.video_model is None:
-        raise HTTPException(status_code=503, detail="Video inference not enabled")
-
-    session = req.app.state.session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-
     if request.stream:
         return JSONResponse(
             status_code=400,
@@ -245,42 +505,65 @@ async def propagate_tracking(session_id: str, request: PropagateRequest, req: Re
         )
 
         start_time = time.time()
-        results: Dict[int, FrameResult] = {}
-
-        # Propagate through video
-        for frame_data in req.app.state.video_model.propagate_in_video(
-            session_id=session_id,
-            direction=request.direction,
-            start_frame_index=request.start_frame_index,
-            max_frames=request.max_frames,
-        ):
-            frame_idx = frame_data["frame_index"]
-            objects = frame_data["objects"]
-
-            results[frame_idx] = FrameResult(frame_index=frame_idx, objects=objects)
-
-        elapsed_ms = (time.time() - start_time) * 1000
+        session_manager = req.app.state.session_manager
+        video_model = req.app.state.video_model
+
+        def generate():
+            """Emit the PropagateResponse JSON incrementally, frame by frame.
+
+            Peak memory stays at one frame of RLE masks and the first byte
+            goes out after the first frame instead of after the whole video.
+            Runs in the threadpool via StreamingResponse's sync-iterator path,
+            so the blocking model generator stays off the event loop.
+            """
+            frames_sent = 0
+            try:
+                yield b'{"session_id":' + orjson.dumps(session_id) + b',"results":['
+
+                for frame_data in video_model.propagate_in_video(
+                    session_id=session_id,
+                    direction=request.direction,
+                    start_frame_index=request.start_frame_index,
+                    max_frames=request.max_frames,
+                ):
+                    if frames_sent:
+                        yield b","
+                    # Matches FrameResult wire format
+                    yield orjson.dumps(
+                        {
+                            "frame_index": frame_data["frame_index"],
+                            "objects": frame_data["objects"],
+                        }
+                    )
+                    frames_sent += 1
+
+                elapsed_ms = (time.time() - start_time) * 1000
+                yield (
+                    b'],"total_frames":%d,"processing_time_ms":%.1f}'
+                    % (frames_sent, elapsed_ms)
+                )
 
-        # Update session stats
-        req.app.state.session_manager.update_session_stats(
-            session_id, frames_processed=len(results)
-        )
-        req.app.state.session_manager.update_session_status(
-            session_id, VideoSessionStatus.READY
-        )
+                session_manager.update_session_stats(
+                    session_id, frames_processed=frames_sent
+                )
+                session_manager.update_session_status(
+                    session_id, VideoSessionStatus.READY
+                )
+            except Exception as e:
+                # Headers are already sent; record the error and cut the stream
+                session_manager.update_session_status(
+                    session_id, VideoSessionStatus.ERROR, error=str(e)
+                )
+                logger.exception("Propagation failed")
+                raise
 
-        return PropagateResponse(
-            session_id=session_id,
-            results=results,
-            total_frames=len(results),
-            processing_time_ms=elapsed_ms,
-        )
+        return StreamingResponse(generate(), media_type="application/json")
 
     except Exception as e:
         req.app.state.session_manager.update_session_status(
             session_id, VideoSessionStatus.ERROR, error=str(e)
         )
-        logger.error(f"Propagation failed: {e}")
+        logger.exception("Propagation failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -297,20 +580,18 @@ async def propagate_tracking_stream(websocket: WebSocket, session_id: str):
     app_state = websocket.scope["app"].state
     
     if app_state.video_model is None:
-        await websocket.send_json(
-            StreamFrameMessage(
-                type="error", error="Video inference not enabled"
-            ).model_dump()
+        await _send_stream_message(
+            websocket,
+            StreamFrameMessage(type="error", error="Video inference not enabled"),
         )
         await websocket.close()
         return
 
     session = app_state.session_manager.get_session(session_id)
     if not session:
-        await websocket.send_json(
-            StreamFrameMessage(
-                type="error", error=f"Session {session_id} not found"
-            ).model_dump()
+        await _send_stream_message(
+            websocket,
+            StreamFrameMessage(type="error", error=f"Session {session_id} not found"),
         )
         await websocket.close()
         return
@@ -327,25 +608,52 @@ async def propagate_tracking_stream(websocket: WebSocket, session_id: str):
         )
 
         frames_sent = 0
-
-        # Stream frame results
-        for frame_data in app_state.video_model.propagate_in_video(
-            session_id=session_id,
-            direction=direction,
-            start_frame_index=start_frame_index,
-            max_frames=max_frames,
+        frame_buffer = []
+        last_flush = time.monotonic()
+
+        async def flush_frames():
+            nonlocal last_flush
+            if frame_buffer:
+                await websocket.send_bytes(
+                    _BATCH_PREFIX + b",".join(frame_buffer) + _BATCH_SUFFIX
+                )
+                frame_buffer.clear()
+            last_flush = time.monotonic()
+
+        # Stream frame results, batched to amortize send overhead. The
+        # blocking model generator is driven in the threadpool — each
+        # frame's GPU forward would otherwise stall the event loop —
+        # rather than parking a bounded-executor worker for the whole video
+        async for frame_data in iterate_in_threadpool(
+            app_state.video_model.propagate_in_video(
+                session_id=session_id,
+                direction=direction,
+                start_frame_index=start_frame_index,
+                max_frames=max_frames,
+            )
         ):
-            message = StreamFrameMessage(
-                type="frame",
-                frame_index=frame_data["frame_index"],
-                objects=frame_data["objects"],
+            # Trusted internal data: splice the varying parts into the
+            # pre-encoded envelope (wire format matches StreamFrameMessage)
+            frame_buffer.append(
+                _FRAME_PREFIX
+                + str(frame_data["frame_index"]).encode()
+                + _FRAME_MID
+                + orjson.dumps(frame_data["objects"])
+                + _FRAME_SUFFIX
             )
-            await websocket.send_json(message.model_dump())
             frames_sent += 1
 
+            if (
+                len(frame_buffer) >= STREAM_BATCH_SIZE
+                or time.monotonic() - last_flush > STREAM_FLUSH_INTERVAL_S
+            ):
+                await flush_frames()
+
+        await flush_frames()
+
         # Send completion message
-        await websocket.send_json(
-            StreamFrameMessage(type="complete", total_frames=frames_sent).model_dump()
+        await websocket.send_bytes(
+            orjson.dumps({"type": "complete", "total_frames": frames_sent})
         )
 
         app_state.session_manager.update_session_stats(
@@ -356,12 +664,12 @@ async def propagate_tracking_stream(websocket: WebSocket, session_id: str):
         )
 
     except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected for session {session_id}")
+        logger.info("WebSocket disconnected for session %s", session_id)
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.exception("WebSocket error")
         try:
-            await websocket.send_json(
-                StreamFrameMessage(type="error", error=str(e)).model_dump()
+            await _send_stream_message(
+                websocket, StreamFrameMessage(type="error", error=str(e))
             )
         except:
             pass
@@ -373,15 +681,10 @@ async def propagate_tracking_stream(websocket: WebSocket, session_id: str):
 
 
 @router.get("/session/{session_id}/status", response_model=SessionStatusResponse)
-async def get_session_status(session_id: str, req: Request):
+async def get_session_status(
+    session_id: str, req: Request, session: dict = Depends(require_video_session)
+):
     """Get current status of a video session."""
-    if req.app.state.video_model is None:
-        raise HTTPException(status_code=503, detail="Video inference not enabled")
-
-    session = req.app.state.session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-
     try:
         session_info = req.app.state.video_model.get_session_info(session_id)
 
@@ -394,20 +697,18 @@ async def get_session_status(session_id: str, req: Request):
             gpu_memory_used_mb=session_info["gpu_memory_mb"],
         )
     except Exception as e:
-        logger.error(f"Failed to get session status: {e}")
+        logger.exception("Failed to get session status")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/session/{session_id}/object/{obj_id}", response_model=RemoveObjectResponse)
-async def remove_object_from_tracking(session_id: str, obj_id: int, req: Request):
+async def remove_object_from_tracking(
+    session_id: str,
+    obj_id: int,
+    req: Request,
+    session: dict = Depends(require_video_session),
+):
     """Remove an object from tracking in the session."""
-    if req.app.state.video_model is None:
-        raise HTTPException(status_code=503, detail="Video inference not enabled")
-
-    session = req.app.state.session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-
     try:
         req.app.state.video_model.remove_object(session_id, obj_id)
 
@@ -420,20 +721,15 @@ async def remove_object_from_tracking(session_id: str, obj_id: int, req: Request
         return RemoveObjectResponse(session_id=session_id, obj_id=obj_id)
 
     except Exception as e:
-        logger.error(f"Failed to remove object: {e}")
+        logger.exception("Failed to remove object")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/session/{session_id}/reset", response_model=ResetSessionResponse)
-async def reset_video_session(session_id: str, req: Request):
+async def reset_video_session(
+    session_id: str, req: Request, session: dict = Depends(require_video_session)
+):
     """Reset session to initial state (clears all prompts and objects)."""
-    if req.app.state.video_model is None:
-        raise HTTPException(status_code=503, detail="Video inference not enabled")
-
-    session = req.app.state.session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-
     try:
         req.app.state.video_model.reset_session(session_id)
 
@@ -451,20 +747,15 @@ async def reset_video_session(session_id: str, req: Request):
         )
 
     except Exception as e:
-        logger.error(f"Failed to reset session: {e}")
+        logger.exception("Failed to reset session")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete("/session/{session_id}", response_model=CloseSessionResponse)
-async def close_video_session(session_id: str, req: Request):
+async def close_video_session(
+    session_id: str, req: Request, session: dict = Depends(require_video_session)
+):
     """Close and cleanup video session."""
-    if req.app.state.video_model is None:
-        raise HTTPException(status_code=503, detail="Video inference not enabled")
-
-    session = req.app.state.session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-
     try:
         # Get memory before closing
         session_info = req.app.state.video_model.get_session_info(session_id)
@@ -481,7 +772,7 @@ async def close_video_session(session_id: str, req: Request):
         )
 
     except Exception as e:
-        logger.error(f"Failed to close session: {e}")
+        logger.exception("Failed to close session")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1,6 +1,6 @@
 """Common Pydantic schemas used across endpoints."""
 from enum import Enum
-from typing import List, Literal, Optional
+from typing import Annotated, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -54,6 +54,12 @@ class BoxPrompt(BaseModel):
 # Union type for all prompts
 Prompt = TextPrompt | PointPrompt | BoxPrompt
 
+# Shared non-empty prompt list; reusing one annotated alias lets Pydantic
+# build and cache its core schema once instead of per consuming model
+PromptList = Annotated[
+    List[Prompt], Field(description="List of prompts for segmentation", min_length=1)
+]
+
 
 class SegmentationResult(BaseModel):
     """Result of segmentation operation."""
@@ -3,16 +3,14 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
-from .common_schemas import ImageSize, Prompt, SegmentationResult
+from .common_schemas import ImageSize, PromptList, SegmentationResult
 
 
 class ImageSegmentRequest(BaseModel):
     """Request for image segmentation."""
 
     image: str = Field(..., description="Base64-encoded image")
-    prompts: List[Prompt] = Field(
-        ..., description="List of prompts for segmentation", min_length=1
-    )
+    prompts: PromptList
     confidence_threshold: float = Field(
         default=0.5, ge=0.0, le=1.0, description="Confidence threshold for filtering"
     )
@@ -42,7 +40,7 @@ class BatchImageItem(BaseModel):
 
     id: str = Field(..., description="Unique identifier for this image")
     image: str = Field(..., description="Base64-encoded image")
-    prompts: List[Prompt] = Field(..., min_length=1)
+    prompts: PromptList
 
 
 class BatchImageRequest(BaseModel):
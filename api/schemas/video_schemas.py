@@ -2,9 +2,9 @@
 from enum import Enum
 from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-from .common_schemas import Prompt
+from .common_schemas import PromptList
 
 
 class VideoSessionStatus(str, Enum):
@@ -61,7 +61,7 @@ class AddPromptRequest(BaseModel):
     """Request to add prompt to video session."""
 
     frame_index: int = Field(..., ge=0, description="Frame index to add prompt")
-    prompts: List[Prompt] = Field(..., min_length=1)
+    prompts: PromptList
     obj_id: Optional[int] = Field(
         None, description="Object ID to refine (None = new object)"
     )
@@ -70,6 +70,10 @@ class AddPromptRequest(BaseModel):
 class VideoObject(BaseModel):
     """Single object in video frame."""
 
+    # Constructed once per object per frame on the streaming path; frozen
+    # enables pydantic-core's hash cache and skips mutation bookkeeping.
+    model_config = ConfigDict(frozen=True, validate_default=False)
+
     id: int = Field(..., description="Unique object ID")
     mask: str = Field(..., description="RLE-encoded mask")
     box: List[float] = Field(..., description="Bounding box [cx, cy, w, h]")
@@ -101,6 +105,8 @@ class PropagateRequest(BaseModel):
 class FrameResult(BaseModel):
     """Result for single video frame."""
 
+    model_config = ConfigDict(frozen=True, validate_default=False)
+
     frame_index: int
     objects: List[VideoObject]
 
@@ -109,7 +115,8 @@ class PropagateResponse(BaseModel):
     """Response for propagation (non-streaming)."""
 
     session_id: str
-    results: Dict[int, FrameResult]  # frame_index -> FrameResult
+    # Frames in propagation order; frame_index is embedded in each result
+    results: List[FrameResult]
     total_frames: int
     processing_time_ms: float
 
@@ -117,6 +124,8 @@ class PropagateResponse(BaseModel):
 class StreamFrameMessage(BaseModel):
     """WebSocket message for streaming frame result."""
 
+    model_config = ConfigDict(frozen=True, validate_default=False)
+
     type: Literal["frame", "complete", "error"] = "frame"
     frame_index: Optional[int] = None
     objects: Optional[List[VideoObject]] = None
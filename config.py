@@ -1,5 +1,6 @@
 """Configuration management for SAM3 Inference Server."""
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -39,6 +40,7 @@ class Settings(BaseSettings):
     )
     image_model_resolution: int = Field(default=1008, alias="IMAGE_MODEL_RESOLUTION")
     image_model_enabled: bool = Field(default=True, alias="IMAGE_MODEL_ENABLED")
+    inference_threads: int = Field(default=1, alias="INFERENCE_THREADS")
 
     # Video Model
     video_model_enabled: bool = Field(default=True, alias="VIDEO_MODEL_ENABLED")
@@ -87,21 +89,21 @@ class Settings(BaseSettings):
     enable_metrics: bool = Field(default=True, alias="ENABLE_METRICS")
     metrics_port: int = Field(default=9090, alias="METRICS_PORT")
 
-    @property
+    @cached_property
     def video_gpu_list(self) -> List[int]:
         """Parse VIDEO_MODEL_GPUS into list of integers."""
         if not self.video_model_gpus:
             return [0]
         return [int(gpu.strip()) for gpu in self.video_model_gpus.split(",")]
 
-    @property
+    @cached_property
     def api_key_list(self) -> List[str]:
         """Parse API_KEYS into list of strings."""
         if not self.api_keys:
             return []
         return [key.strip() for key in self.api_keys.split(",")]
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS_ORIGINS into list of strings."""
         if self.cors_origins == "*":
@@ -114,5 +116,15 @@ class Settings(BaseSettings):
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance.
+
+    Schema construction and .env parsing happen exactly once per process,
+    no matter how many import paths reach this module.
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -1,5 +1,7 @@
 """SAM3 video model wrapper for video segmentation and tracking."""
+import functools
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -15,6 +17,60 @@ from sam3.agent.helpers.rle import rle_encode
 
 logger = get_logger(__name__)
 
+# Single worker shared by all sessions: propagation yields frames in order,
+# and one thread is enough to hide the CPU-side RLE/box conversion behind
+# the GPU inference of the next frame.
+_encode_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rle-encode")
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_video(path: str, mtime: float) -> Tuple[int, int, float]:
+    """Read (width, height, fps) from a video's container header.
+
+    Cached by path + mtime so repeat sessions on the same file (the common
+    case with content-addressed cached downloads) never re-open the
+    container. Returns zeros for anything the header doesn't carry.
+    """
+    import cv2
+
+    width = height = 0
+    fps = 0.0
+    cap = cv2.VideoCapture(path)
+    if cap.isOpened():
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = float(cap.get(cv2.CAP_PROP_FPS))
+    cap.release()
+    return width, height, fps
+
+
+def _encode_frame(frame_idx: int, outputs: Dict) -> Dict:
+    """CPU post-processing for one propagated frame (RLE masks, boxes, scores)."""
+    obj_ids = outputs["out_obj_ids"]          # shape: (N,)
+    probs = outputs["out_probs"]              # shape: (N,)
+    boxes_xywh = outputs["out_boxes_xywh"]    # shape: (N, 4)
+    binary_masks = outputs["out_binary_masks"]  # shape: (N, H, W), dtype=bool
+
+    if len(obj_ids) == 0:
+        return {"frame_index": frame_idx, "objects": []}
+
+    # One rle_encode call over the whole (N, H, W) stack instead of N calls
+    # on (1, H, W) slices; likewise one .tolist() for all boxes.
+    masks_rle = rle_encode(torch.from_numpy(binary_masks).bool())
+    boxes_list = boxes_xywh.tolist()
+
+    objects = [
+        {
+            "id": int(obj_ids[i]),
+            "mask": masks_rle[i]["counts"],
+            "box": boxes_list[i],
+            "score": float(probs[i]),
+        }
+        for i in range(len(obj_ids))
+    ]
+
+    return {"frame_index": frame_idx, "objects": objects}
+
 
 class SAM3VideoModel:
     """Wrapper for SAM3 video predictor with session management."""
@@ -156,17 +212,27 @@ class SAM3VideoModel:
             input_batch = inference_state.get("input_batch")
 
             if input_batch is not None and hasattr(input_batch, "find_inputs"):
-                for t in range(num_frames):
-                    if t < len(input_batch.find_inputs):
-                        find_input = input_batch.find_inputs[t]
-                        if hasattr(find_input, "text_ids"):
-                            text_ids = find_input.text_ids
-                            # Convert list to tensor if needed
-                            if isinstance(text_ids, list):
-                                find_input.text_ids = torch.tensor(
-                                    text_ids, dtype=torch.long, device=self.predictor.device
-                                )
-                                logger.debug(f"Converted text_ids to tensor for frame {t}")
+                # Collect every frame whose text_ids is still a list, upload
+                # them all in one flat host-to-device copy, and hand each
+                # frame a zero-copy narrow() view — one kernel launch instead
+                # of one tiny torch.tensor(...) per frame
+                to_patch = []
+                flat_ids = []
+                for t in range(min(num_frames, len(input_batch.find_inputs))):
+                    find_input = input_batch.find_inputs[t]
+                    text_ids = getattr(find_input, "text_ids", None)
+                    if isinstance(text_ids, list):
+                        to_patch.append((find_input, len(flat_ids), len(text_ids)))
+                        flat_ids.extend(text_ids)
+
+                if to_patch:
+                    flat = torch.tensor(flat_ids, dtype=torch.long)
+                    if torch.cuda.is_available():
+                        flat = flat.pin_memory()
+                    flat = flat.to(self.predictor.device, non_blocking=True)
+                    for find_input, offset, length in to_patch:
+                        find_input.text_ids = flat.narrow(0, offset, length)
+                    logger.debug(f"Converted text_ids to tensors for {len(to_patch)} frames")
         except Exception as e:
             logger.warning(f"Could not patch text_ids in inference_state: {e}")
             # Continue anyway, the error might not occur
@@ -185,33 +251,31 @@ class SAM3VideoModel:
                      inference_state.get("height") or
                      inference_state.get("_video_height", 0))
         
-        # If dimensions are still 0, get them from the video file itself
-        if width == 0 or height == 0:
-            import cv2
-            # Try to get the video path from the session or use the original video_path parameter
-            session_video_path = session.get("video_path", "")
-            if session_video_path and session_video_path != "":
-                cap = cv2.VideoCapture(session_video_path)
-                if cap.isOpened():
-                    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                    cap.release()
-            else:
-                # If we still don't have the video path in session, use the original video_path parameter
-                cap = cv2.VideoCapture(video_path)  # video_path is a parameter to this method
-                if cap.isOpened():
-                    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                    cap.release()
-
+        # Probe the container header (cached by path + mtime) for anything
+        # the inference state doesn't carry: dimensions when they're missing
+        # above, and the real frame rate, which SAM3 never stores
+        fps = 0.0
+        probe_path = session.get("video_path", "") or video_path
+        try:
+            mtime = Path(probe_path).stat().st_mtime
+        except OSError:
+            mtime = None
+        if mtime is not None:
+            probed_width, probed_height, fps = _probe_video(probe_path, mtime)
+            if width == 0 or height == 0:
+                width, height = probed_width, probed_height
+        if fps <= 0.0:
+            fps = 30.0  # Fallback when the header carries no frame rate
+
+        num_frames = inference_state.get("num_frames", 0)
         video_info = {
-            "total_frames": inference_state.get("num_frames", 0),
+            "total_frames": num_frames,
             "resolution": {
                 "width": width,
                 "height": height,
             },
-            "fps": 30.0,  # Default FPS (SAM3 doesn't store this)
-            "duration_seconds": inference_state.get("num_frames", 0) / 30.0,
+            "fps": fps,
+            "duration_seconds": num_frames / fps,
         }
 
         elapsed = (time.time() - start_time) * 1000
@@ -271,28 +335,21 @@ class SAM3VideoModel:
         frame_idx = response["frame_index"]
         outputs = response["outputs"]
 
-        masks_rle = []
-        boxes_xywh = []
-        scores = []
-
         obj_ids = outputs["out_obj_ids"]
         probs = outputs["out_probs"]
         boxes = outputs["out_boxes_xywh"]
         masks = outputs["out_binary_masks"]  # numpy array of shape (N, H, W), dtype=bool
 
-        for i in range(len(obj_ids)):
-            # 1. Преобразуем numpy → torch, добавляем batch dim: (H, W) → (1, H, W)
-            mask_tensor = torch.from_numpy(masks[i]).unsqueeze(0)  # (1, H, W), dtype=torch.bool
-
-            # 2. RLE encode
-            mask_rle = rle_encode(mask_tensor)  # возвращает список из 1 элемента
-            masks_rle.append(mask_rle[0]["counts"])
-
-            # 3. Box
-            boxes_xywh.append(boxes[i].tolist())
-
-            # 4. Score
-            scores.append(float(probs[i]))
+        if len(obj_ids) > 0:
+            # Single batched rle_encode over (N, H, W) instead of one call
+            # per object on (1, H, W) slices
+            masks_rle = [m["counts"] for m in rle_encode(torch.from_numpy(masks).bool())]
+            boxes_xywh = boxes.tolist()
+            scores = [float(p) for p in probs]
+        else:
+            masks_rle = []
+            boxes_xywh = []
+            scores = []
         elapsed = (time.time() - start_time) * 1000
         logger.info(
             f"Added prompt to frame {frame_idx} in session {session_id}: "
@@ -335,41 +392,23 @@ class SAM3VideoModel:
         start_time = time.time()
         frames_processed = 0
 
+        # One-frame pipeline: while the predictor works on frame t+1 on the
+        # GPU, frame t is RLE-encoded on the worker thread. We hold at most
+        # one pending frame so memory use stays flat and frames are still
+        # yielded in order.
+        pending = None
         for response in self.predictor.handle_stream_request(request):
-            frame_idx = response["frame_index"]
-            outputs = response["outputs"]
-            
-            # Extract arrays
-            obj_ids = outputs["out_obj_ids"]          # shape: (N,)
-            probs = outputs["out_probs"]              # shape: (N,)
-            boxes_xywh = outputs["out_boxes_xywh"]    # shape: (N, 4)
-            binary_masks = outputs["out_binary_masks"]  # shape: (N, H, W)
-
-            # Convert outputs to standard format
-            objects = []
-            for i in range(len(obj_ids)):
-                obj_id = obj_ids[i]
-                mask_np = binary_masks[i]  # This is a NumPy array of dtype=bool
-                #mask_tensor = torch.from_numpy(masks[i]).unsqueeze(0)  # (1, H, W), dtype=torch.bool
-                # Convert to torch tensor with correct dtype for rle_encode
-                mask_tensor = torch.from_numpy(mask_np).unsqueeze(0).bool()  # Ensure torch.bool
-
-                # Encode RLE
-                mask_rle = rle_encode(mask_tensor)  # pycocotools expects NumPy bool array
-
-                # Convert box from XYWH to XYXY if needed? (not required if your system uses XYWH)
-                box = boxes_xywh[i].tolist()
-                score = float(probs[i])
-
-                objects.append({
-                    "id": int(obj_id),
-                    "mask": mask_rle[0]["counts"],  # assuming rle_encode returns list of dicts
-                    "box": box,
-                    "score": score,
-                })
+            future = _encode_executor.submit(
+                _encode_frame, response["frame_index"], response["outputs"]
+            )
+            if pending is not None:
+                frames_processed += 1
+                yield pending.result()
+            pending = future
 
+        if pending is not None:
             frames_processed += 1
-            yield {"frame_index": frame_idx, "objects": objects}
+            yield pending.result()
 
         elapsed = (time.time() - start_time) * 1000
         logger.info(
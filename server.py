@@ -1,4 +1,5 @@
 """SAM3 Inference Server - FastAPI Application."""
+import asyncio
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -7,6 +8,7 @@ import torch
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
 from config import settings
@@ -17,6 +19,7 @@ logger.add(
     sys.stdout,
     format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
     level=settings.log_level,
+    enqueue=True,
 )
 
 # Global model instances - commented out as they are replaced with app.state
@@ -50,16 +53,23 @@ async def lifespan(app: FastAPI):
     # Load image model if enabled
     if settings.image_model_enabled:
         try:
-            from models.sam3_image import SAM3ImageModel
+            from models.sam3_image import get_image_model
 
             logger.info(f"Loading SAM3 image model...{settings.sam3_checkpoint},{settings.sam3_bpe_path}")
-            app.state.image_model = SAM3ImageModel(
+            app.state.image_model = get_image_model(
                 checkpoint='/app/server/sam_weights/sam3.pt',
                 bpe_path=settings.sam3_bpe_path,
                 device=settings.image_model_device,
                 confidence_threshold=settings.image_model_confidence_threshold,
                 resolution=settings.image_model_resolution,
                 compile=settings.image_model_compile,
+                cache_ttl_seconds=settings.feature_cache_ttl_seconds,
+                max_cache_size_mb=settings.max_cache_size_mb,
+                disk_cache_dir=(
+                    str(Path(settings.upload_dir) / "feature_cache")
+                    if settings.enable_feature_cache
+                    else None
+                ),
             )
             logger.info("✓ Image model loaded successfully")
         except Exception as e:
@@ -95,12 +105,21 @@ async def lifespan(app: FastAPI):
             else:
                 logger.warning("Video inference will be disabled")
 
+    # Bound /tmp usage from content-addressed video caching
+    video_cache_task = None
+    if settings.video_model_enabled:
+        from api.routes.video import cleanup_video_cache
+
+        video_cache_task = asyncio.create_task(cleanup_video_cache())
+
     logger.info("Server startup complete")
 
     yield
 
     # Shutdown: Cleanup
     logger.info("Shutting down server...")
+    if video_cache_task is not None:
+        video_cache_task.cancel()
     if app.state.image_model:
         app.state.image_model.clear_cache()
     if app.state.video_model:
@@ -116,6 +135,9 @@ app = FastAPI(
     description="FastAPI server for SAM3 (Segment Anything 3) image and video inference",
     version="1.0.0",
     lifespan=lifespan,
+    # orjson serializes in C; mask-heavy responses are dominated by JSON
+    # encoding under the stdlib path
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -127,12 +149,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Import and include routers
-from api.routes import health, image, video
+# Security headers on every response
+from api.middleware.security import SecurityHeadersMiddleware
+
+app.add_middleware(SecurityHeadersMiddleware)
+
+# Rate limiting
+if settings.rate_limit_enabled:
+    from api.middleware.security import RateLimitMiddleware
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        requests_per_minute=settings.rate_limit_requests_per_minute,
+    )
+
+# API-key auth on inference routes (health stays open for probes).
+# The auth object itself is built lazily on the first guarded request.
+auth_dependencies = None
+if settings.require_api_key:
+    from fastapi import Depends
+
+    from api.middleware.security import verify_api_key
+
+    auth_dependencies = [Depends(verify_api_key)]
+
+# Import and include routers. The video router (and its transitive SAM3
+# imports) is skipped entirely when video inference is disabled, cutting
+# per-worker boot time and RSS for image-only deployments.
+from api.routes import health, image
 
 app.include_router(health.router, tags=["Health"])
-app.include_router(image.router, prefix="/api/v1/image", tags=["Image"])
-app.include_router(video.router, prefix="/api/v1/video", tags=["Video"])
+app.include_router(
+    image.router,
+    prefix="/api/v1/image",
+    tags=["Image"],
+    dependencies=auth_dependencies,
+)
+if settings.video_model_enabled:
+    from api.routes import video
+
+    app.include_router(
+        video.router,
+        prefix="/api/v1/video",
+        tags=["Video"],
+        dependencies=auth_dependencies,
+    )
 
 # Root endpoint
 @app.get("/")
@@ -155,6 +216,10 @@ def main():
         reload=settings.reload,
         workers=settings.server_workers if not settings.reload else 1,
         log_level=settings.log_level.lower(),
+        # uvloop + httptools roughly double ASGI throughput on the
+        # I/O-bound endpoints (health, session management) vs asyncio+h11
+        loop="uvloop",
+        http="httptools",
     )
 
 
@@ -16,6 +16,15 @@ def sample_image_base64():
     return base64.b64encode(buffer.getvalue()).decode()
 
 
+@pytest.fixture
+def sample_image_png():
+    """Create sample image as raw PNG bytes."""
+    img = Image.new("RGB", (100, 100), color="red")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
 def test_segment_text_prompt(client: TestClient, sample_image_base64: str):
     """Test segmentation with text prompt."""
     response = client.post(
@@ -117,3 +126,108 @@ def test_empty_prompts(client: TestClient, sample_image_base64: str):
 
     # Should fail validation
     assert response.status_code == 422
+
+
+def test_segment_batch_per_item_errors(client: TestClient, sample_image_base64: str):
+    """Test that a failing batch item is reported without failing the batch."""
+    response = client.post(
+        "/api/v1/image/segment-batch",
+        json={
+            "images": [
+                {
+                    "id": "good",
+                    "image": sample_image_base64,
+                    "prompts": [{"type": "text", "text": "person"}],
+                },
+                {
+                    "id": "bad",
+                    "image": "not-a-valid-image",
+                    "prompts": [{"type": "text", "text": "person"}],
+                },
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["total_images"] == 2
+    assert data["successful"] == 1
+    assert data["failed"] == 1
+    results_by_id = {r["id"]: r for r in data["results"]}
+    assert results_by_id["bad"]["error"] is not None
+    assert results_by_id["good"]["error"] is None
+
+
+def test_segment_batch_empty_prompts_item(client: TestClient, sample_image_base64: str):
+    """Test that an item with an empty prompt list fails validation."""
+    response = client.post(
+        "/api/v1/image/segment-batch",
+        json={
+            "images": [
+                {"id": "empty", "image": sample_image_base64, "prompts": []},
+            ],
+        },
+    )
+
+    assert response.status_code == 422
+
+
+def test_segment_batch_no_images(client: TestClient):
+    """Test that an empty batch fails validation."""
+    response = client.post("/api/v1/image/segment-batch", json={"images": []})
+
+    assert response.status_code == 422
+
+
+def test_segment_binary_raw_rgb_size_mismatch(client: TestClient):
+    """Test raw_rgb upload whose payload doesn't match width*height*3."""
+    response = client.post(
+        "/api/v1/image/segment/binary",
+        files={"file": ("image.raw", b"\x00" * 10, "application/octet-stream")},
+        data={
+            "prompts": '[{"type": "text", "text": "person"}]',
+            "format": "raw_rgb",
+            "width": 4,
+            "height": 4,
+        },
+    )
+
+    assert response.status_code == 400
+    assert "size mismatch" in response.json()["detail"]
+
+
+def test_segment_binary_raw_rgb_missing_dimensions(client: TestClient):
+    """Test raw_rgb upload without width/height."""
+    response = client.post(
+        "/api/v1/image/segment/binary",
+        files={"file": ("image.raw", b"\x00" * 48, "application/octet-stream")},
+        data={
+            "prompts": '[{"type": "text", "text": "person"}]',
+            "format": "raw_rgb",
+        },
+    )
+
+    assert response.status_code == 400
+
+
+def test_segment_binary_empty_prompts(client: TestClient, sample_image_png: bytes):
+    """Test binary upload with an empty prompts list."""
+    response = client.post(
+        "/api/v1/image/segment/binary",
+        files={"file": ("image.png", sample_image_png, "image/png")},
+        data={"prompts": "[]"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_segment_binary_invalid_prompts_json(client: TestClient, sample_image_png: bytes):
+    """Test binary upload with malformed prompts JSON."""
+    response = client.post(
+        "/api/v1/image/segment/binary",
+        files={"file": ("image.png", sample_image_png, "image/png")},
+        data={"prompts": "not json"},
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,115 @@
+"""Tests for security middleware: rate limiting, API-key auth, headers."""
+import pytest
+from fastapi import Depends, FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from api.middleware.security import (
+    APIKeyAuth,
+    RateLimitMiddleware,
+    SecurityHeadersMiddleware,
+)
+
+
+@pytest.fixture
+def limited_client():
+    """Client against a minimal app with a 2-requests-per-minute limit."""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    app.add_middleware(RateLimitMiddleware, requests_per_minute=2)
+    return TestClient(app)
+
+
+def test_rate_limit_returns_429_with_retry_after(limited_client: TestClient):
+    """Test that exhausting the bucket yields 429 with a Retry-After hint."""
+    assert limited_client.get("/ping").status_code == 200
+    assert limited_client.get("/ping").status_code == 200
+
+    response = limited_client.get("/ping")
+
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Rate limit exceeded"
+    assert int(response.headers["Retry-After"]) >= 0
+
+
+def test_rate_limit_exempts_health(limited_client: TestClient):
+    """Test that probe endpoints are never rate limited."""
+    for _ in range(5):
+        assert limited_client.get("/health").status_code == 200
+
+
+def test_security_headers_present():
+    """Test that the static security headers are appended to responses."""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(SecurityHeadersMiddleware)
+    client = TestClient(app)
+
+    response = client.get("/ping")
+
+    assert response.status_code == 200
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-frame-options"] == "DENY"
+
+
+@pytest.fixture
+def auth_client():
+    """Client against a minimal app with one API-key-guarded route."""
+    app = FastAPI()
+    auth = APIKeyAuth(["test-key"])
+
+    @app.get("/guarded", dependencies=[Depends(auth)])
+    async def guarded():
+        return {"ok": True}
+
+    @app.websocket("/ws", dependencies=[Depends(auth)])
+    async def guarded_ws(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_json({"ok": True})
+        await websocket.close()
+
+    return TestClient(app)
+
+
+def test_missing_api_key_returns_401(auth_client: TestClient):
+    """Test guarded route without credentials."""
+    response = auth_client.get("/guarded")
+
+    assert response.status_code == 401
+
+
+def test_invalid_api_key_returns_403(auth_client: TestClient):
+    """Test guarded route with a wrong key."""
+    response = auth_client.get(
+        "/guarded", headers={"Authorization": "Bearer wrong-key"}
+    )
+
+    assert response.status_code == 403
+
+
+def test_valid_api_key_passes(auth_client: TestClient):
+    """Test guarded route with the configured key."""
+    response = auth_client.get(
+        "/guarded", headers={"Authorization": "Bearer test-key"}
+    )
+
+    assert response.status_code == 200
+
+
+def test_valid_api_key_passes_on_websocket(auth_client: TestClient):
+    """Test that the auth dependency also works on websocket routes."""
+    with auth_client.websocket_connect(
+        "/ws", headers={"Authorization": "Bearer test-key"}
+    ) as websocket:
+        assert websocket.receive_json() == {"ok": True}
@@ -0,0 +1,21 @@
+"""Shared bounded executor for GPU-bound model calls."""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def inference_executor() -> ThreadPoolExecutor:
+    """Process-wide executor that bounds concurrent model forwards.
+
+    Model calls funnel through this small pool instead of the default
+    ~32-thread executor: the GPU serializes kernels per device anyway,
+    so extra concurrent forwards only multiply peak VRAM and contend on
+    the processor, whose thread safety is unestablished. Decode and
+    other I/O keep using the default executor. Sized by
+    INFERENCE_THREADS (default 1).
+    """
+    from config import settings
+
+    return ThreadPoolExecutor(
+        max_workers=settings.inference_threads, thread_name_prefix="inference"
+    )
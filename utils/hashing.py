@@ -0,0 +1,55 @@
+"""Fast hashing helpers shared across API routes."""
+import hashlib
+
+from PIL import Image
+
+try:
+    import blake3
+
+    _HAS_BLAKE3 = True
+except ImportError:
+    _HAS_BLAKE3 = False
+
+
+def fast_hasher():
+    """Return an incremental hasher using the fastest available algorithm.
+
+    Prefers BLAKE3 (SIMD-accelerated, ~10x faster than MD5 per byte) and
+    falls back to BLAKE2b-128 when the optional `blake3` package is not
+    installed — faster than MD5 on modern CPUs and, unlike MD5, available
+    under FIPS-hardened OpenSSL builds.
+    """
+    if _HAS_BLAKE3:
+        return blake3.blake3()
+    return hashlib.blake2b(digest_size=16)
+
+
+def fast_hexdigest(data: bytes) -> str:
+    """One-shot hex digest of `data` using the fastest available algorithm.
+
+    For non-cryptographic uses (cache keys, dedup filenames) where a
+    cryptographic hash's guarantees are pure overhead.
+    """
+    hasher = fast_hasher()
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def image_cache_key(image: Image.Image) -> str:
+    """Compute a cache key from the raw decoded pixel buffer.
+
+    Hashes `image.tobytes()` directly instead of re-encoding to PNG, which
+    avoids a full DEFLATE compression pass per request. Image size and mode
+    are mixed into the hash to avoid collisions between images whose raw
+    buffers happen to match at different dimensions.
+
+    Args:
+        image: Decoded PIL Image
+
+    Returns:
+        Hex digest string usable as a feature-cache key
+    """
+    hasher = fast_hasher()
+    hasher.update(f"{image.size}{image.mode}".encode())
+    hasher.update(image.tobytes())
+    return hasher.hexdigest()